@@ -232,13 +232,16 @@ def restore_image(float_input_data: np.ndarray) -> np.ndarray:
 
 
 
-def images_transform_pipeline(array_or_path, resize_to=224, crop_to=None):
+def images_transform_pipeline(array_or_path, resize_to=224, crop_to=None, lazy_imgs=False):
     """[summary]
 
     Args:
         array_or_path ([type]): [description]
         resize_to (int, optional): [description]. Defaults to 224.
         crop_to ([type], optional): [description]. Defaults to None.
+        lazy_imgs (bool, optional): if True, a callable that returns the uint8 images is returned instead of the 
+            images, so that the copy (or the restoration from float input data) is only done when the images are 
+            needed, e.g., for visualization. Defaults to False.
     """
     def read_image_func(path):
         return read_image(path, target_size=resize_to, crop_size=crop_to)
@@ -265,12 +268,19 @@ def images_transform_pipeline(array_or_path, resize_to=224, crop_to=None):
 
         if np.issubdtype(array_or_path.dtype, np.integer):
             # array_or_path is an image.
-            uint8_imgs = uint8_imgs.copy()
             float_input_data = preprocess_image(uint8_imgs)
+            if lazy_imgs:
+                return (lambda: uint8_imgs.copy()), float_input_data
+            uint8_imgs = uint8_imgs.copy()
         else:
             # array_or_path is float input data.
-            uint8_imgs = restore_image(array_or_path.copy())
             float_input_data = array_or_path
+            if lazy_imgs:
+                return (lambda: restore_image(array_or_path.copy())), float_input_data
+            uint8_imgs = restore_image(array_or_path.copy())
+
+    if lazy_imgs:
+        return (lambda: uint8_imgs), float_input_data
 
     return uint8_imgs, float_input_data
 
@@ -114,7 +114,7 @@ class InputGradientInterpreter(Interpreter):
             "paddle_model has to be " \
             "an instance of paddle.nn.Layer or a compatible one."
 
-    def _build_predict_fn(self, rebuild: bool = False, gradient_of: str = 'probability'):
+    def _build_predict_fn(self, rebuild: bool = False, gradient_of: str = 'probability', to_static: bool = False):
         """Build ``predict_fn`` for input gradients based algorithms.
         The model is supposed to be a classification model.
 
@@ -123,24 +123,39 @@ class InputGradientInterpreter(Interpreter):
             gradient_of (str, optional): computes the gradient of 
                 [``"loss"``, ``"logit"`` or ``"probability"``] *w.r.t.* input data. Defaults to ``"probability"``. 
                 Other options can get similar results while the absolute scale might be different.
+            to_static (bool, optional): converts the model's forward function with ``paddle.jit.to_static``, using 
+                the input shape (with a free batch dimension) as the ``InputSpec``. Later calls with the same input 
+                shape reuse the converted graph, and a new input shape is converted again. Defaults to ``False``.
         """
 
         if self.predict_fn is not None:
             assert callable(self.predict_fn), "predict_fn is predefined before, but is not callable." \
                 "Check it again."
 
-        if self.predict_fn is None or rebuild:
+        # the built predict_fn is reused across calls of ``interpret``, unless it was built with another mode.
+        mode = (gradient_of, to_static)
+        built_mode = getattr(self, '_predict_fn_mode', None)
+        if self.predict_fn is None or rebuild or (built_mode is not None and built_mode != mode):
             assert gradient_of in ['loss', 'logit', 'probability']
 
             self._paddle_env_setup()
 
-            def predict_fn(inputs, labels=None):
+            static_forwards = {}  # converted forward functions, keyed by the input shapes without batch dimension.
+
+            def predict_fn(inputs, labels=None, return_tensor=False, amp_dtype=None, out=None):
                 """predict_fn for input gradients based interpreters,
                     for image classification models only.
 
                 Args:
                     inputs ([type]): scaled inputs.
                     labels ([type]): can be None.
+                    return_tensor (bool, optional): return the gradients as a Paddle tensor that stays on the 
+                        device, instead of copying them to a numpy array. Defaults to ``False``.
+                    amp_dtype (str, optional): if ``"bfloat16"``, the forward pass runs under 
+                        ``paddle.amp.auto_cast`` with this dtype, on GPUs only. Logits and input gradients are still 
+                        float32. Defaults to ``None``.
+                    out (np.ndarray, optional): a preallocated array, e.g., a slice of a larger result array, where
+                        the gradients are written to. It is also returned as the gradients. Defaults to ``None``.
 
                 Returns:
                     [type]: gradients, labels
@@ -149,6 +164,8 @@ class InputGradientInterpreter(Interpreter):
                 # assert len(data.shape) == 4  # [bs, h, w, 3]
                 assert labels is None or \
                     (isinstance(labels, (list, np.ndarray)) and len(labels) == inputs.shape[0])
+                # float16 would need loss scaling, the probability gradients underflow without it.
+                assert amp_dtype in [None, 'bfloat16'], "amp_dtype should be None or 'bfloat16'."
 
                 if isinstance(inputs, tuple):
                     tensor_inputs = []
@@ -162,8 +179,24 @@ class InputGradientInterpreter(Interpreter):
                     tensor_inputs.stop_gradient = False
                     tensor_inputs = (tensor_inputs, )
 
+                forward = self.paddle_model
+                if to_static:
+                    key = tuple(tuple(inp.shape[1:]) for inp in tensor_inputs)
+                    if key not in static_forwards:
+                        input_spec = [
+                            paddle.static.InputSpec(shape=[None] + list(inp.shape[1:]), dtype=inp.dtype)
+                            for inp in tensor_inputs
+                        ]
+                        static_forwards[key] = paddle.jit.to_static(self.paddle_model.forward, input_spec=input_spec)
+                    forward = static_forwards[key]
+
                 # get logits and probas, [bs, num_c]
-                logits = self.paddle_model(*tensor_inputs)
+                if amp_dtype is None:
+                    logits = forward(*tensor_inputs)
+                else:
+                    with paddle.amp.auto_cast(level='O1', dtype=amp_dtype):
+                        logits = forward(*tensor_inputs)
+                    logits = paddle.cast(logits, 'float32')
                 num_samples, num_classes = logits.shape[0], logits.shape[1]
                 probas = paddle.nn.functional.softmax(logits, axis=-1)
 
@@ -187,12 +220,16 @@ class InputGradientInterpreter(Interpreter):
 
                 loss.backward()
                 gradients = tensor_inputs[0].grad
-                if isinstance(gradients, paddle.Tensor):
+                if isinstance(gradients, paddle.Tensor) and not return_tensor:
                     gradients = gradients.numpy()
+                if out is not None:
+                    np.copyto(out, gradients)
+                    gradients = out
 
                 return gradients, labels, probas
 
             self.predict_fn = predict_fn
+            self._predict_fn_mode = mode
 
 
 class InputOutputInterpreter(Interpreter):
@@ -559,13 +596,15 @@ class IntermediateGradientInterpreter(Interpreter):
         if self.predict_fn is not None:
             assert callable(self.predict_fn), \
                 "predict_fn is predefined before, but is not callable. Check it again."
-            return
 
-        if self.predict_fn is None or rebuild:
+        # the built predict_fn is reused across calls of ``interpret``, unless it was built with another mode.
+        mode = (layer_name, gradient_of)
+        built_mode = getattr(self, '_predict_fn_mode', None)
+        if self.predict_fn is None or rebuild or (built_mode is not None and built_mode != mode):
             assert gradient_of in ['loss', 'logit', 'probability']
             self._paddle_env_setup()
 
-            def predict_fn(inputs, label=None, scale=None, noise_amount=None):
+            def predict_fn(inputs, label=None, scale=None, noise_amount=None, return_tensor=False):
                 import paddle
                 inputs = tuple(paddle.to_tensor(inp) for inp in inputs) if isinstance(inputs, tuple) \
                         else (paddle.to_tensor(inputs), )
@@ -611,9 +650,14 @@ class IntermediateGradientInterpreter(Interpreter):
                 gradients = target_feature_map[0].grad
                 loss.clear_gradient()
 
+                if return_tensor:
+                    # keep the outputs on the device, no copy to numpy.
+                    return gradients, label, target_feature_map[0], probas
+
                 if isinstance(gradients, paddle.Tensor):
                     gradients = gradients.numpy()
 
                 return gradients, label, target_feature_map[0].numpy(), probas.numpy()
 
-        self.predict_fn = predict_fn
+            self.predict_fn = predict_fn
+            self._predict_fn_mode = mode
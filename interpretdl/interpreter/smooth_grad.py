@@ -1,11 +1,32 @@
 import numpy as np
 from tqdm import tqdm
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 from .abc_interpreter import InputGradientInterpreter, IntermediateGradientInterpreter
 from ..data_processor.readers import images_transform_pipeline, preprocess_save_path
 from ..data_processor.visualizer import explanation_to_vis, show_vis_explanation, save_image
 
+try:
+    from numba import njit, prange
+except ImportError:
+    # not installed, or installed but incompatible with the installed numpy.
+    njit = None
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _add_scaled_noise(noise, data, stds):
+        """noise = data + stds * noise, in place and in one pass. noise: [n, bsz, d], data: [bsz, d], stds: [bsz]."""
+        n, bsz, d = noise.shape
+        for k in prange(n * bsz):
+            i, j = k // bsz, k % bsz
+            for t in range(d):
+                noise[i, j, t] = data[j, t] + stds[j] * noise[i, j, t]
+else:
+    _add_scaled_noise = None
+
+
 class SmoothGradInterpreter(InputGradientInterpreter):
     """
     Smooth Gradients Interpreter.
@@ -37,13 +58,19 @@ class SmoothGradInterpreter(InputGradientInterpreter):
                   labels: list or np.ndarray = None,
                   noise_amount: int = 0.1,
                   n_samples: int = 50,
+                  batch_size: int = 32,
+                  seed: int or np.random.Generator = None,
+                  amp_dtype: str = None,
+                  antithetic: bool = False,
+                  to_static: bool = False,
                   resize_to: int = 224,
                   crop_to: int = None,
                   visual: bool = True,
                   save_path: str = None) -> np.ndarray:
         """The technical details of the SmoothGrad method are described as follows:
         SmoothGrad generates ``n_samples`` noised inputs, with the noise scale of ``noise_amount``, and then computes 
-        the gradients *w.r.t.* these noised inputs. The final explanation is averaged gradients.
+        the gradients *w.r.t.* these noised inputs. The final explanation is averaged gradients. The noised inputs
+        are passed to the model in batches of ``batch_size`` images instead of one noised copy at a time.
 
         Args:
             inputs (str or list): The input image filepath or a list of filepaths or numpy array of read images.
@@ -52,6 +79,23 @@ class SmoothGradInterpreter(InputGradientInterpreter):
             noise_amount (int, optional): Noise level of added noise to the image. The std of Gaussian random noise 
                 is ``noise_amount`` * (x :sub:`max` - x :sub:`min`). Default: ``0.1``.
             n_samples (int, optional): The number of new images generated by adding noise. Default: ``50``.
+            batch_size (int, optional): The maximum number of noised images passed to the model at once. Each batch 
+                contains whole noised copies of all the input images, i.e., at least ``len(inputs)`` images. Lower it
+                if the GPU memory is insufficient. Default: ``32``.
+            seed (int or np.random.Generator, optional): The seed of the random generator (``np.random.default_rng``)
+                used for drawing the noises, in float32 directly. A ``np.random.Generator`` can also be given and 
+                reused across calls. If None, the global numpy random state is used, so that ``np.random.seed`` 
+                still controls the results. Default: ``None``.
+            amp_dtype (str, optional): If ``"bfloat16"``, the forward passes of the noised inputs run with 
+                automatic mixed precision of this dtype, which is much faster on recent GPUs. Paddle only enables it 
+                on GPUs, so it has no effect with ``device='cpu'``. The gradients are still accumulated in float32 or 
+                higher. Default: ``None``.
+            antithetic (bool, optional): Whether to use antithetic sampling, i.e., each noise is paired with its 
+                negation. This reduces the variance of the averaged gradients, so that fewer ``n_samples`` are needed 
+                for the same quality. ``n_samples`` should be even. Default: ``False``.
+            to_static (bool, optional): Whether to convert the model's forward function with 
+                ``paddle.jit.to_static`` for the input shape, which skips the Python overhead of the dynamic graph in 
+                the following calls. The model should be convertible. Default: ``False``.
             resize_to (int, optional): Images will be rescaled with the shorter edge being ``resize_to``. Defaults to 
                 ``224``.
             crop_to (int, optional): After resize, images will be center cropped to a square image with the size 
@@ -64,12 +108,15 @@ class SmoothGradInterpreter(InputGradientInterpreter):
             np.ndarray: the explanation result.
         """
 
-        imgs, data = images_transform_pipeline(inputs, resize_to, crop_to)
-        # print(imgs.shape, data.shape, imgs.dtype, data.dtype)  # (1, 224, 224, 3) (1, 3, 224, 224) uint8 float32
+        import paddle
+
+        # uint8 images are only needed for visualization, obtained from ``get_imgs`` then.
+        get_imgs, data = images_transform_pipeline(inputs, resize_to, crop_to, lazy_imgs=True)
+        # print(data.shape, data.dtype)  # (1, 3, 224, 224) float32
 
         bsz = len(data)
 
-        self._build_predict_fn(gradient_of='probability')
+        self._build_predict_fn(gradient_of='probability', to_static=to_static)
 
         # obtain the labels (and initialization).
         _, predicted_label, predicted_proba = self.predict_fn(data, labels)
@@ -80,18 +127,61 @@ class SmoothGradInterpreter(InputGradientInterpreter):
         labels = np.array(labels).reshape((bsz, ))
 
         # SmoothGrad
-        max_axis = tuple(np.arange(1, data.ndim))
-        stds = noise_amount * (np.max(data, axis=max_axis) - np.min(data, axis=max_axis))
-
-        total_gradients = np.zeros_like(data)
-        for i in tqdm(range(n_samples), leave=True, position=0):
-            noise = np.concatenate(
-                [np.float32(np.random.normal(0.0, stds[j], (1, ) + tuple(d.shape))) for j, d in enumerate(data)])
-            _noised_data = data + noise
-            gradients, _, _ = self.predict_fn(_noised_data, labels)
-            total_gradients += gradients
-
-        avg_gradients = total_gradients / n_samples
+        assert not antithetic or n_samples % 2 == 0, "n_samples should be even when antithetic is True."
+        stds = np.float32(noise_amount) * np.ptp(data, axis=tuple(range(1, data.ndim)))
+        stds_b = stds.reshape((bsz, ) + (1, ) * (data.ndim - 1)).astype(np.float32)
+
+        # noised copies are drawn batch by batch into two buffers, [n_copies, bsz, ...], used in turn: a worker
+        # thread fills the next one while the model runs on the current one. The noise buffer is reused in place
+        # for the noised data, no extra allocation.
+        # on CPU devices, if numba is installed, scaling the noise and adding the data are fused in one parallel pass.
+        # on GPU devices the host is not the bottleneck, so the JIT compilation is not worth it.
+        fused = _add_scaled_noise is not None and self.device[:3] == 'cpu'
+        rng = None if seed is None else np.random.default_rng(seed)
+        data_flat = np.ascontiguousarray(data).reshape((bsz, -1))
+        stds_flat = stds_b.reshape((bsz, ))
+
+        def _fill_noised(buf):
+            noise = buf[:len(buf) // 2] if antithetic else buf
+            if rng is None:
+                noise[...] = np.random.standard_normal(noise.shape)
+            else:
+                rng.standard_normal(out=noise, dtype=np.float32)
+            if antithetic:
+                np.negative(noise, out=buf[len(noise):])
+            if fused:
+                _add_scaled_noise(buf.reshape(buf.shape[:2] + (-1, )), data_flat, stds_flat)
+            else:
+                np.multiply(buf, stds_b, out=buf)
+                np.add(buf, data, out=buf)
+            return buf.reshape((-1, ) + data.shape[1:])
+
+        n_copies = max(1, min(n_samples, batch_size // bsz))
+        if antithetic:
+            # each batch holds whole pairs of (noise, -noise).
+            n_copies = max(2, n_copies - n_copies % 2)
+        copies_per_batch = [min(n_copies, n_samples - i) for i in range(0, n_samples, n_copies)]
+        noise_bufs = [np.empty((n_copies, ) + data.shape, dtype=np.float32) for _ in range(2)]
+        labels_noised = np.tile(np.ascontiguousarray(labels, dtype=np.int64), n_copies)
+
+        # gradients are reduced and accumulated on the device, and copied back only once at the end.
+        # accumulate in float64 to avoid the rounding drift of summing many float32 gradients.
+        total_gradients = paddle.zeros(data.shape, dtype='float64')
+        predict_fn = self.predict_fn
+        grad_shape = (-1, ) + data.shape
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                tqdm(total=n_samples, mininterval=1.0, leave=True, position=0) as pbar:
+            future = executor.submit(_fill_noised, noise_bufs[0][:copies_per_batch[0]])
+            for i, n in enumerate(copies_per_batch):
+                data_noised = future.result()
+                if i + 1 < len(copies_per_batch):
+                    future = executor.submit(_fill_noised, noise_bufs[(i + 1) % 2][:copies_per_batch[i + 1]])
+                gradients = predict_fn(data_noised, labels_noised[:n * bsz], return_tensor=True,
+                                       amp_dtype=amp_dtype)[0]
+                total_gradients += paddle.sum(gradients.reshape(grad_shape), axis=0, dtype='float64')
+                pbar.update(n)
+
+        avg_gradients = (total_gradients / n_samples).numpy().astype(data.dtype)
 
         # visualize and save image.
         if save_path is None and not visual:
@@ -99,15 +189,20 @@ class SmoothGradInterpreter(InputGradientInterpreter):
             pass
         else:
             save_path = preprocess_save_path(save_path, bsz)
-            for i in range(bsz):
-                # print(imgs[i].shape, avg_gradients[i].shape)
-                vis_explanation = explanation_to_vis(imgs[i],
-                                                     np.abs(avg_gradients[i]).sum(0),
-                                                     style='overlay_grayscale')
-                if visual:
-                    show_vis_explanation(vis_explanation)
-                if save_path[i] is not None:
-                    save_image(save_path[i], vis_explanation)
+            imgs = get_imgs()
+            vis_maps = np.abs(avg_gradients).sum(1)
+            # images are encoded and written by worker threads, overlapped with the visualization of the next ones.
+            with ThreadPoolExecutor(max_workers=min(8, bsz)) as executor:
+                saving = []
+                for i in range(bsz):
+                    # print(imgs[i].shape, avg_gradients[i].shape)
+                    vis_explanation = explanation_to_vis(imgs[i], vis_maps[i], style='overlay_grayscale')
+                    if visual:
+                        show_vis_explanation(vis_explanation)
+                    if save_path[i] is not None:
+                        saving.append(executor.submit(save_image, save_path[i], vis_explanation))
+                for future in saving:
+                    future.result()
 
         # intermediate results, for possible further usages.
         self.labels = labels
@@ -157,13 +252,17 @@ class SmoothGradNLPInterpreter(IntermediateGradientInterpreter):
             data (tupleornp.ndarray): The inputs to the NLP model.
             labels (listornp.ndarray, optional): The target labels to analyze. If None, the most likely label 
                 will be used. Default: ``None``.
-            steps (int, optional): number of steps in the Riemann approximation of the integral. Default: ``50``.
+            noise_amount (int, optional): Noise level of added noise to the embeddings. The std of Gaussian random 
+                noise is ``noise_amount`` * ``embedding.mean()``. Default: ``0.1``.
+            n_samples (int, optional): The number of noised embeddings. Default: ``50``.
             embedding_name (str, optional): name of the embedding layer at which the noises will be applied. 
                 The name of embedding can be verified through ``print(model)``. Defaults to ``word_embeddings``. 
 
         Returns:
             np.ndarray or tuple: explanations, or (explanations, pred).
         """
+        import paddle
+
         assert (tokenizer is None) + (text_to_input_fn is None) == 1, "only one of them should be given."
 
         # tokenizer to text_to_input_fn.
@@ -188,12 +287,14 @@ class SmoothGradNLPInterpreter(IntermediateGradientInterpreter):
         gradients, label, _, proba = self.predict_fn(model_input, label, noise_amount=None)
 
         # SG
-        total_gradients = np.zeros_like(gradients)
-        for i in tqdm(range(n_samples), leave=True, position=0):
-            gradients, _, _, _ = self.predict_fn(model_input, label, noise_amount=noise_amount)
-            total_gradients += gradients
-
-        sg_gradients = total_gradients / n_samples
+        # gradients are accumulated on the device, and copied back only once at the end.
+        total_gradients = paddle.zeros(gradients.shape, dtype='float64')
+        predict_fn = self.predict_fn
+        for _ in tqdm(range(n_samples), mininterval=1.0, leave=True, position=0):
+            _gradients = predict_fn(model_input, label, noise_amount=noise_amount, return_tensor=True)[0]
+            total_gradients += paddle.cast(_gradients, 'float64')
+
+        sg_gradients = (total_gradients / n_samples).numpy().astype(gradients.dtype)
 
         # intermediate results, for possible further usages.
         self.predicted_label = label
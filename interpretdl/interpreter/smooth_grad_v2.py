@@ -41,6 +41,7 @@ class SmoothGradInterpreterV2(InputGradientInterpreter):
                   noise_amount: int = 0.1,
                   n_samples: int = 50,
                   split: int = 2,
+                  seed: int or np.random.Generator = None,
                   resize_to: int = 224,
                   crop_to: int = None,
                   visual: bool = True,
@@ -59,6 +60,10 @@ class SmoothGradInterpreterV2(InputGradientInterpreter):
                 is ``noise_amount`` * (x :sub:`max` - x :sub:`min`). Default: ``0.1``.
             n_samples (int, optional): The number of new images generated by adding noise. Default: ``50``.
             split (int, optional): The number of splits. Default: ``2``.
+            seed (int or np.random.Generator, optional): The seed of the random generator (``np.random.default_rng``)
+                used for drawing the noises, in float32 directly. A ``np.random.Generator`` can also be given and 
+                reused across calls. If None, the global numpy random state is used, so that ``np.random.seed`` 
+                still controls the results. Default: ``None``.
             resize_to (int, optional): Images will be rescaled with the shorter edge being ``resize_to``. Defaults to 
                 ``224``.
             crop_to (int, optional): After resize, images will be center cropped to a square image with the size 
@@ -88,33 +93,35 @@ class SmoothGradInterpreterV2(InputGradientInterpreter):
         labels = np.array(labels).reshape((1, ))
 
         # SmoothGrad
-        max_axis = tuple(np.arange(1, data.ndim))
-        stds = noise_amount * (np.max(data, axis=max_axis) - np.min(data, axis=max_axis))
+        stds = np.float32(noise_amount) * np.ptp(data, axis=tuple(range(1, data.ndim)))
+        stds_b = stds.reshape((len(data), ) + (1, ) * (data.ndim - 1)).astype(np.float32)
 
-        data_noised = []
-        for i in range(n_samples):
-            noise = np.concatenate(
-                [np.float32(np.random.normal(0.0, stds[j], (1, ) + tuple(d.shape))) for j, d in enumerate(data)])
-            data_noised.append(data + noise)
-
-        data_noised = np.concatenate(data_noised, axis=0)
+        if seed is None:
+            noise = np.random.standard_normal((n_samples, ) + data.shape).astype(np.float32, copy=False)
+        else:
+            noise = np.random.default_rng(seed).standard_normal((n_samples, ) + data.shape, dtype=np.float32)
+        noise *= stds_b
+        np.add(noise, data, out=noise)
+        data_noised = noise.reshape((-1, ) + data.shape[1:])
+        labels_noised = np.tile(np.ascontiguousarray(labels, dtype=np.int64), n_samples)
         # print(data_i.shape, labels.shape)
         # print(data_noised.shape)  # n_samples, 3, 224, 224
 
         # splits, to avoid large GPU memory usage.
         if split > 1:
+            # each split writes its gradients into its slice of the result, no concatenation.
             chunk = n_samples // split
-            gradient_chunks = []
+            gradients = np.empty_like(data_noised)
             for i in range(split - 1):
-                gradients_i, _, _ = self.predict_fn(data_noised[i * chunk:(i + 1) * chunk], np.repeat(labels, chunk))
-                gradient_chunks.append(gradients_i)
-            gradients_s, _, _ = self.predict_fn(data_noised[chunk * (split - 1):],
-                                             np.repeat(labels, n_samples - chunk * (split - 1)))
-            gradient_chunks.append(gradients_s)
-            gradients = np.concatenate(gradient_chunks, axis=0)
+                self.predict_fn(data_noised[i * chunk:(i + 1) * chunk],
+                                labels_noised[i * chunk:(i + 1) * chunk],
+                                out=gradients[i * chunk:(i + 1) * chunk])
+            self.predict_fn(data_noised[chunk * (split - 1):],
+                            labels_noised[chunk * (split - 1):],
+                            out=gradients[chunk * (split - 1):])
         else:
             # one split.
-            gradients, _, _ = self.predict_fn(data_noised, np.repeat(labels, n_samples))
+            gradients, _, _ = self.predict_fn(data_noised, labels_noised)
 
         avg_gradients = np.mean(gradients, axis=0, keepdims=True)
         # visualize and save image.
@@ -123,12 +130,12 @@ class SmoothGradInterpreterV2(InputGradientInterpreter):
             pass
         else:
             save_path = preprocess_save_path(save_path, 1)
-            # print(imgs[i].shape, avg_gradients[i].shape)
-            vis_explanation = explanation_to_vis(imgs[i], np.abs(avg_gradients[0]).sum(0), style='overlay_grayscale')
+            # print(imgs[0].shape, avg_gradients[0].shape)
+            vis_explanation = explanation_to_vis(imgs[0], np.abs(avg_gradients[0]).sum(0), style='overlay_grayscale')
             if visual:
                 show_vis_explanation(vis_explanation)
-            if save_path[i] is not None:
-                save_image(save_path[i], vis_explanation)
+            if save_path[0] is not None:
+                save_image(save_path[0], vis_explanation)
 
         # intermediate results, for possible further usages.
         self.labels = labels
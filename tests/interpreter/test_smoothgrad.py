@@ -1,9 +1,12 @@
 import unittest
+import paddle
 from paddle.vision.models import mobilenet_v2
 import numpy as np
 import os
 import interpretdl as it
-from tests.utils import assert_arrays_almost_equal
+from interpretdl.interpreter.smooth_grad import _add_scaled_noise
+from interpretdl.data_processor.readers import images_transform_pipeline
+from tests.utils import assert_arrays_almost_equal, tiny_nlp_model
 
 
 class TestSG(unittest.TestCase):
@@ -43,6 +46,78 @@ class TestSG(unittest.TestCase):
 
         assert_arrays_almost_equal(self, result, desired)
 
+    def test_batch_size(self):
+        paddle_model = mobilenet_v2(pretrained=True)
+
+        img_path = np.random.randint(0, 255, size=(1, 64, 64, 3), dtype=np.uint8)
+        algo = it.SmoothGradInterpreter(paddle_model, device='cpu')
+        np.random.seed(42)
+        exp_batched = algo.interpret(img_path, n_samples=5, batch_size=32, visual=False)
+        np.random.seed(42)
+        exp_single = algo.interpret(img_path, n_samples=5, batch_size=1, visual=False)
+
+        result = np.array([exp_batched.mean(), exp_batched.std(), exp_batched.min(), exp_batched.max()])
+        desired = np.array([exp_single.mean(), exp_single.std(), exp_single.min(), exp_single.max()])
+
+        assert_arrays_almost_equal(self, result, desired)
+
+    def test_seed(self):
+        paddle_model = mobilenet_v2(pretrained=True)
+
+        img_path = np.random.randint(0, 255, size=(1, 64, 64, 3), dtype=np.uint8)
+        algo = it.SmoothGradInterpreter(paddle_model, device='cpu')
+        exp1 = algo.interpret(img_path, n_samples=5, seed=42, visual=False)
+        exp2 = algo.interpret(img_path, n_samples=5, seed=42, visual=False)
+        result = np.array([exp1.mean(), exp1.std(), exp1.min(), exp1.max()])
+        desired = np.array([exp2.mean(), exp2.std(), exp2.min(), exp2.max()])
+
+        assert_arrays_almost_equal(self, result, desired)
+
+    def test_antithetic(self):
+        paddle_model = mobilenet_v2(pretrained=True)
+
+        np.random.seed(42)
+        img = np.random.randint(0, 255, size=(1, 64, 64, 3), dtype=np.uint8)
+        algo = it.SmoothGradInterpreter(paddle_model, device='cpu')
+        # batch_size=3 is rounded down to one (noise, -noise) pair per batch.
+        exp = algo.interpret(img, n_samples=4, batch_size=3, antithetic=True, seed=42, visual=False)
+
+        # manual average over the pairs, drawn from the same random stream.
+        _, data = images_transform_pipeline(img)
+        std = np.float32(0.1) * np.ptp(data)
+        rng = np.random.default_rng(42)
+        total_gradients = np.zeros(data.shape, dtype=np.float64)
+        for _ in range(2):
+            noise = std * rng.standard_normal(data.shape, dtype=np.float32)
+            gradients, _, _ = algo.predict_fn(np.concatenate([data + noise, data - noise]), np.repeat(algo.labels, 2))
+            total_gradients += gradients.sum(0)
+        desired = total_gradients / 4
+
+        result = np.array([exp.mean(), exp.std(), exp.min(), exp.max()])
+        desired = np.array([desired.mean(), desired.std(), desired.min(), desired.max()])
+        assert_arrays_almost_equal(self, result, desired)
+
+    def test_to_static(self):
+        paddle_model = mobilenet_v2(pretrained=True)
+        img_path = 'imgs/catdog.jpg'
+        algo = it.SmoothGradInterpreter(paddle_model, device='cpu')
+        exp = algo.interpret(img_path, n_samples=2, seed=42, resize_to=256, crop_to=224, visual=False)
+
+        algo_static = it.SmoothGradInterpreter(paddle_model, device='cpu')
+        exp_static = algo_static.interpret(img_path, n_samples=2, seed=42, to_static=True, resize_to=256,
+                                           crop_to=224, visual=False)
+        result = np.array([exp_static.mean(), exp_static.std(), exp_static.min(), exp_static.max()])
+        desired = np.array([exp.mean(), exp.std(), exp.min(), exp.max()])
+        assert_arrays_almost_equal(self, result, desired)
+
+        # another input shape with the same predict_fn is converted again.
+        exp = algo.interpret(img_path, n_samples=2, seed=42, resize_to=128, crop_to=112, visual=False)
+        exp_static = algo_static.interpret(img_path, n_samples=2, seed=42, to_static=True, resize_to=128,
+                                           crop_to=112, visual=False)
+        result = np.array([exp_static.mean(), exp_static.std(), exp_static.min(), exp_static.max()])
+        desired = np.array([exp.mean(), exp.std(), exp.min(), exp.max()])
+        assert_arrays_almost_equal(self, result, desired)
+
     def test_shape_v2(self):
         paddle_model = mobilenet_v2(pretrained=True)
         img_path = 'imgs/catdog.jpg'
@@ -62,5 +137,70 @@ class TestSG(unittest.TestCase):
 
         assert_arrays_almost_equal(self, result, np.array([1, 3, 224, 224]))
 
+    @unittest.skipIf(_add_scaled_noise is None, "numba is not installed.")
+    def test_add_scaled_noise(self):
+        np.random.seed(42)
+        noise = np.random.standard_normal((4, 2, 3 * 8 * 8)).astype(np.float32)
+        data = np.random.standard_normal((2, 3 * 8 * 8)).astype(np.float32)
+        stds = np.array([0.1, 0.5], dtype=np.float32)
+
+        desired = noise * stds.reshape((2, 1)) + data
+        _add_scaled_noise(noise, data, stds)
+
+        assert_arrays_almost_equal(self, noise, desired, limit=1e-6)
+
+    @unittest.skipUnless(paddle.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0,
+                         "auto_cast has no effect on CPU.")
+    def test_amp(self):
+        paddle_model = mobilenet_v2(pretrained=True)
+        img_path = 'imgs/catdog.jpg'
+        algo = it.SmoothGradInterpreter(paddle_model, device='gpu:0')
+        exp = algo.interpret(img_path, n_samples=2, seed=42, resize_to=256, crop_to=224, visual=False)
+
+        # the output dtype of the first conv shows whether auto_cast took effect.
+        conv_dtypes = []
+        conv = next(layer for layer in paddle_model.sublayers() if isinstance(layer, paddle.nn.Conv2D))
+        handle = conv.register_forward_post_hook(lambda layer, input, output: conv_dtypes.append(output.dtype))
+        exp_amp = algo.interpret(img_path, n_samples=2, seed=42, amp_dtype='bfloat16', resize_to=256, crop_to=224,
+                                 visual=False)
+        handle.remove()
+
+        self.assertIn(paddle.bfloat16, conv_dtypes)
+        self.assertEqual(exp_amp.dtype, np.float32)
+        self.assertEqual(exp_amp.shape, (1, 3, 224, 224))
+        # bfloat16 keeps about 3 significant digits, so only the overall agreement is checked.
+        self.assertGreater(np.corrcoef(exp_amp.ravel(), exp.ravel())[0, 1], 0.9)
+        self.assertAlmostEqual(exp_amp.std(), exp.std(), delta=0.1 * exp.std())
+
+    def test_amp_float16(self):
+        paddle_model = mobilenet_v2(pretrained=True)
+        img_path = 'imgs/catdog.jpg'
+        algo = it.SmoothGradInterpreter(paddle_model, device='cpu')
+        with self.assertRaises(AssertionError):
+            algo.interpret(img_path, n_samples=2, amp_dtype='float16', resize_to=256, crop_to=224, visual=False)
+
+    def test_nlp_rebuild_predict_fn(self):
+        paddle_model = tiny_nlp_model()
+        input_ids = np.random.randint(0, 100, size=(1, 16))
+        algo = it.SmoothGradNLPInterpreter(paddle_model, device='cpu')
+        text_to_input_fn = lambda raw_text: (input_ids, )
+
+        algo.interpret('', text_to_input_fn=text_to_input_fn, n_samples=1, embedding_name='word_embeddings')
+        predict_fn = algo.predict_fn
+        algo.interpret('', text_to_input_fn=text_to_input_fn, n_samples=1, embedding_name='word_embeddings')
+        self.assertIs(algo.predict_fn, predict_fn)
+
+        # a new embedding layer requires a new predict_fn.
+        exp = algo.interpret('', text_to_input_fn=text_to_input_fn, n_samples=1,
+                             embedding_name='position_embeddings')
+        self.assertIsNot(algo.predict_fn, predict_fn)
+        self.assertEqual(algo._predict_fn_mode, ('position_embeddings', 'probability'))
+        self.assertEqual(exp.shape, (1, 16, 32))
+
+        predict_fn = algo.predict_fn
+        algo._build_predict_fn(rebuild=True, layer_name='position_embeddings')
+        self.assertIsNot(algo.predict_fn, predict_fn)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
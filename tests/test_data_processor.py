@@ -78,6 +78,15 @@ class TestImageProcessingMethods(unittest.TestCase):
         uint8_img = read_image(img_path)
         images_transform_pipeline(uint8_img[0])
 
+    def test_transform_lazy_imgs(self):
+        img_path = 'imgs/catdog.jpg'
+        uint8_img = read_image(img_path)
+        imgs, data = images_transform_pipeline(uint8_img)
+        get_imgs, lazy_data = images_transform_pipeline(uint8_img, lazy_imgs=True)
+
+        self.assertTrue(np.array_equal(get_imgs(), imgs))
+        self.assertTrue(np.array_equal(lazy_data, data))
+
     def test_read_image_wrong(self):
         img_path = {'a': 'imgs/catdog.jpg'}
         try:
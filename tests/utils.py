@@ -14,3 +14,25 @@ def assert_arrays_almost_equal(test: unittest.TestCase, actuals: np.ndarray, des
     for _, (input, ref) in enumerate(zip(actuals.ravel(), desires.ravel())):
         delta = max(abs(ref * dif_ratio), limit)
         test.assertAlmostEqual(input, ref, delta=delta)
+
+
+def tiny_nlp_model(vocab_size=100, hidden_size=32, num_classes=2):
+    """A small randomly initialized text classifier with ``word_embeddings`` and ``position_embeddings`` layers, 
+    for testing NLP interpreters without pretrained models."""
+    import paddle
+
+    class TinyNLPModel(paddle.nn.Layer):
+
+        def __init__(self):
+            super().__init__()
+            self.word_embeddings = paddle.nn.Embedding(vocab_size, hidden_size)
+            self.position_embeddings = paddle.nn.Embedding(512, hidden_size)
+            self.classifier = paddle.nn.Linear(hidden_size, num_classes)
+
+        def forward(self, input_ids):
+            positions = paddle.arange(input_ids.shape[1]).unsqueeze(0)
+            embeddings = self.word_embeddings(input_ids) + self.position_embeddings(positions)
+            return self.classifier(paddle.tanh(embeddings).mean(axis=1))
+
+    paddle.seed(42)
+    return TinyNLPModel()